@@ -12,8 +12,18 @@ from data_collector import BaseballSavantCollector
 from data_processor import StatcastProcessor
 from umpire_analyzer import UmpireImpactAnalyzer
 from report_generator import ScoutingReportGenerator
+import numpy as np
 import pandas as pd
 
+# Scouting tier boundaries (projected xwOBA improvement), shared by the
+# examples below so every tier decision is a single vectorized pd.cut.
+# Cut with right=False so each boundary belongs to the tier above it
+# ([0.035, inf) is Elite), matching the report generator's
+# searchsorted(side='right') tiers and the printed ">=" labels.
+TIER_BINS = [-np.inf, 0.010, 0.020, 0.035, np.inf]
+TIER_LABELS = ['LOW IMPACT TARGET 📉', 'MEDIUM IMPACT TARGET 📊',
+               'HIGH IMPACT TARGET 📈', 'ELITE TARGET 🎯']
+
 def example_quick_analysis():
     """Example: Quick analysis for recent data"""
     print("=== QUICK SCOUTING ANALYSIS EXAMPLE ===")
@@ -33,12 +43,12 @@ def example_quick_analysis():
     # Process the data
     processor = StatcastProcessor()
     
-    # Save raw data temporarily
-    raw_path = 'data/raw/example_data.csv'
-    df.to_csv(raw_path, index=False)
-    
+    # Save raw data temporarily (Parquet: smaller on disk, much faster to re-load than CSV)
+    raw_path = 'data/raw/example_data.parquet'
+    df.to_parquet(raw_path, engine='pyarrow', compression='zstd', index=False)
+
     # Process it
-    processed_df = processor.process_full_dataset('example_data.csv', 'example_processed.csv')
+    processed_df = processor.process_full_dataset('example_data.parquet', 'example_processed.parquet')
     
     if processed_df.empty:
         print("No processed data. Try a larger date range.")
@@ -54,13 +64,11 @@ def example_quick_analysis():
         print("No psychological impact found. Need more data with sufficient bad calls.")
         return
     
-    # Show top results
+    # Show top results in one formatted emission instead of a print-per-row loop
     print("\nTop undervalued targets from this sample:")
-    for _, player in analysis_df.head(5).iterrows():
-        improvement = player['projected_xwoba_improvement']
-        current = player['current_season_xwoba_estimate']
-        potential = player['robo_ump_xwoba_estimate']
-        print(f"Player {player['batter']}: +{improvement:.3f} xwOBA ({current:.3f} → {potential:.3f})")
+    top5 = analysis_df.head(5)[['batter', 'current_season_xwoba_estimate',
+                                'robo_ump_xwoba_estimate', 'projected_xwoba_improvement']]
+    print(top5.to_string(index=False, float_format='%.3f'))
 
 def example_player_lookup():
     """Example: Look up specific player's psychological impact"""
@@ -87,17 +95,9 @@ def example_player_lookup():
     print(f"Projected improvement: +{top_player['projected_xwoba_improvement']:.3f}")
     print(f"Percentage of PAs affected by bad calls: {top_player['pct_pas_affected_by_bad_calls']:.1f}%")
     
-    # Scouting recommendation
-    improvement = top_player['projected_xwoba_improvement']
-    if improvement >= 0.035:
-        tier = "ELITE TARGET 🎯"
-    elif improvement >= 0.020:
-        tier = "HIGH IMPACT TARGET 📈"
-    elif improvement >= 0.010:
-        tier = "MEDIUM IMPACT TARGET 📊"
-    else:
-        tier = "LOW IMPACT TARGET 📉"
-    
+    # Scouting recommendation (same bins/labels as the team analysis)
+    tier = pd.cut([top_player['projected_xwoba_improvement']],
+                  bins=TIER_BINS, labels=TIER_LABELS, right=False)[0]
     print(f"Scouting tier: {tier}")
 
 def example_team_analysis():
@@ -114,15 +114,15 @@ def example_team_analysis():
         print("No data in analysis results.")
         return
     
-    # Categorize players by impact level
-    elite = df[df['projected_xwoba_improvement'] >= 0.035]
-    high = df[(df['projected_xwoba_improvement'] >= 0.020) & (df['projected_xwoba_improvement'] < 0.035)]
-    medium = df[(df['projected_xwoba_improvement'] >= 0.010) & (df['projected_xwoba_improvement'] < 0.020)]
-    
+    # Categorize players by impact level in one pass instead of three masks
+    tier = pd.cut(df['projected_xwoba_improvement'], bins=TIER_BINS,
+                  labels=TIER_LABELS, right=False)
+    counts = tier.value_counts()
+
     print("SCOUTING SUMMARY BY TIER:")
-    print(f"Elite targets (≥0.035 xwOBA improvement): {len(elite)} players")
-    print(f"High impact targets (0.020-0.035): {len(high)} players") 
-    print(f"Medium impact targets (0.010-0.020): {len(medium)} players")
+    print(f"Elite targets (≥0.035 xwOBA improvement): {counts[TIER_LABELS[3]]} players")
+    print(f"High impact targets (0.020-0.035): {counts[TIER_LABELS[2]]} players")
+    print(f"Medium impact targets (0.010-0.020): {counts[TIER_LABELS[1]]} players")
     
     print(f"\nTotal undervalued players identified: {len(df)}")
     print(f"Average xwOBA improvement potential: +{df['projected_xwoba_improvement'].mean():.3f}")
@@ -148,19 +148,15 @@ def example_free_agent_analysis():
     
     print("HIGH-VALUE FREE AGENT TARGETS:")
     print("(Players whose market value likely doesn't reflect robo-ump potential)\n")
-    
-    for i, (_, player) in enumerate(targets.head(10).iterrows(), 1):
-        improvement = player['projected_xwoba_improvement']
-        current = player['current_season_xwoba_estimate']
-        potential = player['robo_ump_xwoba_estimate']
-        affected_pct = player['pct_pas_affected_by_bad_calls']
-        
-        print(f"{i:2d}. Player {player['batter']}")
-        print(f"    Market perception (current): {current:.3f} xwOBA")
-        print(f"    True talent (robo-ump):      {potential:.3f} xwOBA")
-        print(f"    Hidden value:                +{improvement:.3f} ({improvement*1000:.0f} points)")
-        print(f"    PAs affected by psychology:  {affected_pct:.1f}%")
-        print()
+
+    # Pre-format once and emit a single table; no iterrows, no per-row prints
+    fmt = targets.head(10).assign(
+        hidden_pts=lambda d: (d['projected_xwoba_improvement'] * 1000).astype(int))
+    fmt = fmt[['batter', 'current_season_xwoba_estimate', 'robo_ump_xwoba_estimate',
+               'projected_xwoba_improvement', 'hidden_pts', 'pct_pas_affected_by_bad_calls']]
+    fmt.columns = ['player', 'current_xwoba', 'robo_ump_xwoba',
+                   'improvement', 'hidden_pts', 'pct_pas_affected']
+    print(fmt.to_string(index=False, float_format='%.3f'))
 
 def main():
     """Run all examples"""
@@ -11,35 +11,115 @@ from __future__ import annotations
 
 import os
 import time
-import math
 import calendar
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
-from typing import Optional, Sequence, List, Tuple, Set
+from typing import Optional, Sequence, List
 
 import pandas as pd
-from pybaseball import statcast, cache as pb_cache
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+from pybaseball import statcast
+
+__all__ = [
+    "DESIRED_COLS",
+    "BaseballSavantCollector",
+    "fetch_month_robust",
+    "fetch_statcast_regular",
+    "fetch_statcast_regular_arrow",
+    "build_parquet_years",
+    "load_parquet_years",
+]
 
 # -----------------------------
 # Column set used downstream
 # -----------------------------
 DESIRED_COLS: List[str] = [
-    "game_year", "pitch_type", "release_speed", "player_name", "batter", "pitcher",
+    "game_year", "game_date", "pitch_type", "release_speed", "player_name", "batter", "pitcher",
     "events", "description", "stand", "p_throws", "type", "bb_type",
     "balls", "strikes", "outs_when_up", "inning", "inning_topbot",
-    "game_pk", "plate_x", "plate_z",
+    "game_pk", "plate_x", "plate_z", "sz_top", "sz_bot", "woba_value",
     "estimated_woba_using_speedangle", "estimated_ba_using_speedangle",
     "launch_speed_angle", "pitch_number", "at_bat_number",
 ]
 
+# Compact dtypes for DESIRED_COLS: float32 for continuous measures, nullable
+# small ints for counts/ids, dictionary-encoded categoricals for the
+# low-cardinality strings. Roughly quarters memory vs. pybaseball's defaults.
+DTYPES = {
+    "game_year": "Int16",
+    "release_speed": "float32",
+    "plate_x": "float32",
+    "plate_z": "float32",
+    "sz_top": "float32",
+    "sz_bot": "float32",
+    "woba_value": "float32",
+    "estimated_woba_using_speedangle": "float32",
+    "estimated_ba_using_speedangle": "float32",
+    "balls": "Int16",
+    "strikes": "Int16",
+    "outs_when_up": "Int16",
+    "inning": "Int16",
+    "pitch_number": "Int16",
+    "at_bat_number": "Int16",
+    "launch_speed_angle": "Int16",
+    "batter": "Int32",
+    "pitcher": "Int32",
+    "game_pk": "Int32",
+    "pitch_type": "category",
+    "events": "category",
+    "description": "category",
+    "stand": "category",
+    "p_throws": "category",
+    "type": "category",
+    "bb_type": "category",
+    "inning_topbot": "category",
+}
+
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast to the compact schema above, silently skipping absent columns."""
+    return df.astype({c: t for c, t in DTYPES.items() if c in df.columns}, copy=False)
+
+
 # -----------------------------
 # Robust window fetch with retries
 # -----------------------------
 
-def _fetch_window(start_str: str, end_str: str, max_retries: int = 3, pause: float = 1.0) -> pd.DataFrame:
-    """Fetch a date window via pybaseball.statcast with simple retries/backoff."""
+# Cap concurrent hits against baseballsavant.mlb.com regardless of pool size.
+_API_SEMAPHORE = threading.Semaphore(2)
+
+# Parquet-backed fetch cache keyed by (start, end) date window. Replaces the
+# pybaseball CSV cache: zstd parquet entries are ~5x smaller and rehydrate in
+# tens of ms instead of a full CSV re-parse. Caching is a plain parameter
+# threaded down from the public entry points — no process-wide toggle, so one
+# caller opting out never disables caching for concurrent callers.
+_WINDOW_CACHE_DIR = os.environ.get("STATCAST_CACHE_DIR", ".statcast_cache")
+
+
+def _fetch_window(start_str: str, end_str: str, max_retries: int = 3, pause: float = 1.0,
+                  use_cache: bool = True) -> pd.DataFrame:
+    """Fetch a date window via pybaseball.statcast with simple retries/backoff.
+
+    Results are cached as zstd parquet under _WINDOW_CACHE_DIR so repeat runs
+    rehydrate from columnar binary instead of re-fetching/re-parsing CSV.
+    """
+    cache_path = os.path.join(_WINDOW_CACHE_DIR, f"{start_str}_{end_str}.parquet")
+    if use_cache and os.path.exists(cache_path):
+        return pq.read_table(cache_path).to_pandas(types_mapper=pd.ArrowDtype)
+
     for attempt in range(1, max_retries + 1):
         try:
-            return statcast(start_dt=start_str, end_dt=end_str)
+            with _API_SEMAPHORE:
+                df = statcast(start_dt=start_str, end_dt=end_str)
+            if use_cache and df is not None:
+                os.makedirs(_WINDOW_CACHE_DIR, exist_ok=True)
+                pq.write_table(pa.Table.from_pandas(df, preserve_index=False),
+                               cache_path, compression="zstd")
+            return df
         except Exception:  # transient CSV/parse/network hiccups
             if attempt == max_retries:
                 raise
@@ -51,80 +131,146 @@ def _date_str(d: date) -> str:
     return d.strftime("%Y-%m-%d")
 
 
-def _split_dates(start_d: date, end_d: date, chunks: int):
-    """Yield (start, end) inclusive ranges split into ~equal `chunks`."""
-    total_days = (end_d - start_d).days + 1
-    size = max(1, math.ceil(total_days / chunks))
-    cur = start_d
-    while cur <= end_d:
-        nxt = min(cur + timedelta(days=size - 1), end_d)
-        yield cur, nxt
-        cur = nxt + timedelta(days=1)
-
-
 # -----------------------------
-# Fetch a month, degrading to smaller windows on failure
+# Fetch a month, bisecting only the windows that actually fail
 # -----------------------------
 
+def _fetch_range_bisect(s: date, e: date, memo: dict, verbose: bool,
+                        use_cache: bool = True) -> List[pd.DataFrame]:
+    """Fetch [s, e] inclusive; on failure, split at the midpoint and recurse.
+
+    Only the failing sub-range gets refined, so a single bad day costs
+    O(log days) calls instead of a full daily sweep. Successful ranges are
+    memoized so concurrent callers never refetch the same window. The two
+    halves of a split are fetched concurrently (_API_SEMAPHORE still caps
+    the real request rate).
+    """
+    key = (s, e)
+    if key in memo:
+        return memo[key]
+    s_str, e_str = _date_str(s), _date_str(e)
+    try:
+        if verbose:
+            print(f"    Fetch {s_str}..{e_str}")
+        df = _fetch_window(s_str, e_str, max_retries=3, pause=1.0, use_cache=use_cache)
+        frames = [df] if df is not None and not df.empty else []
+    except Exception as err:
+        if s == e:  # a single day that never succeeds is a hard failure
+            raise err
+        if verbose:
+            print(f"    Bisecting {s_str}..{e_str}: {err}")
+        mid = s + timedelta(days=(e - s).days // 2)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            left = pool.submit(_fetch_range_bisect, s, mid, memo, verbose, use_cache)
+            right = pool.submit(_fetch_range_bisect, mid + timedelta(days=1), e, memo, verbose, use_cache)
+            frames = left.result() + right.result()
+    memo[key] = frames
+    return frames
+
+
+# Process-wide memo of completed months, so overlapping callers (e.g. the
+# thread pools in fetch_statcast_regular and build_parquet_years running in
+# the same process) never fetch or re-filter the same window twice. Bounded
+# LRU: the memo exists to absorb *concurrent* interest in the same months,
+# not to pin a decade of frames for the process lifetime — unbounded, a full
+# 2015-2024 fetch held the entire dataset twice. Cold re-requests fall back
+# to the on-disk window cache, so eviction only costs a re-filter.
+_MONTH_MEMO: OrderedDict = OrderedDict()
+_MONTH_MEMO_MAX = 4
+_MONTH_MEMO_LOCK = threading.Lock()
+
+
 def fetch_month_robust(year: int, month: int, game_type: str = "R",
                        desired_cols: Sequence[str] | None = None,
-                       verbose: bool = True) -> pd.DataFrame:
+                       verbose: bool = True, use_cache: bool = True) -> pd.DataFrame:
     if desired_cols is None:
         desired_cols = DESIRED_COLS
 
+    memo_key = (year, month, game_type, tuple(desired_cols))
+    with _MONTH_MEMO_LOCK:
+        if memo_key in _MONTH_MEMO:
+            if verbose:
+                print(f"  [memo] {year}-{month:02d} already fetched this process")
+            _MONTH_MEMO.move_to_end(memo_key)
+            return _MONTH_MEMO[memo_key]
+
     start_d = date(year, month, 1)
     end_d = date(year, month, calendar.monthrange(year, month)[1])
 
-    # Strategy ladder: full month -> halves -> ~10-day chunks -> daily
-    strategies = []
-    strategies.append([(start_d, end_d)])
-    mid = start_d + timedelta(days=((end_d - start_d).days // 2))
-    strategies.append([(start_d, mid), (mid + timedelta(days=1), end_d)])
-    strategies.append(list(_split_dates(start_d, end_d, chunks=max(1, math.ceil((end_d - start_d).days / 10)))))
-    strategies.append([(start_d + timedelta(days=i), start_d + timedelta(days=i)) for i in range((end_d - start_d).days + 1)])
-
     frames: List[pd.DataFrame] = []
-    last_err: Optional[Exception] = None
-
-    for idx, strat in enumerate(strategies, start=1):
-        if verbose:
-            print(f"  Strategy {idx}: {len(strat)} window(s)")
-        frames = []
-        try:
-            for (s, e) in strat:
-                s_str, e_str = _date_str(s), _date_str(e)
-                if verbose:
-                    print(f"    Fetch {s_str}..{e_str}")
-                df = _fetch_window(s_str, e_str, max_retries=3, pause=1.0)
-                if df is None or df.empty:
-                    continue
-                if "game_type" not in df.columns:
-                    continue
-                df = df[df["game_type"] == game_type]
-                if df.empty:
-                    continue
-                df = df.reindex(columns=desired_cols)
-                frames.append(df)
-            if frames:
-                break
-        except Exception as err:  # try finer granularity
-            last_err = err
-            if verbose:
-                print(f"    Strategy {idx} failed: {err}")
+    for df in _fetch_range_bisect(start_d, end_d, {}, verbose, use_cache):
+        if "game_type" not in df.columns:
             continue
+        df = df[df["game_type"] == game_type]
+        if df.empty:
+            continue
+        frames.append(_compact_dtypes(df.reindex(columns=desired_cols)))
 
     if not frames:
-        if last_err:
-            raise last_err
-        return pd.DataFrame({c: pd.Series(dtype="object") for c in desired_cols})
+        result = pd.DataFrame({c: pd.Series(dtype="object") for c in desired_cols})
+    else:
+        result = pd.concat(frames, ignore_index=True)
 
-    return pd.concat(frames, ignore_index=True)
+    with _MONTH_MEMO_LOCK:
+        _MONTH_MEMO[memo_key] = result
+        _MONTH_MEMO.move_to_end(memo_key)
+        while len(_MONTH_MEMO) > _MONTH_MEMO_MAX:
+            _MONTH_MEMO.popitem(last=False)
+    return result
 
 
 # -----------------------------
-# Public: fetch across years into a single DataFrame (optionally filter by workload)
+# Public: fetch across years (Arrow-native, plus a pandas-facing wrapper)
 # -----------------------------
 
+def _fetch_months(start_year: int, end_year: int, desired_cols: Sequence[str],
+                  game_type: str, show_progress: bool, use_cache: bool = True) -> "dict":
+    """Fetch Mar..Nov for each year on a thread pool; return {(yr, mo): DataFrame}.
+
+    Months are independent, I/O-bound downloads; _API_SEMAPHORE keeps the
+    actual hit rate against the API polite regardless of pool size.
+    """
+    months = [(yr, mo) for yr in range(start_year, end_year + 1) for mo in range(3, 12)]
+    results: dict = {}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = {
+            pool.submit(fetch_month_robust, yr, mo, game_type, desired_cols,
+                        show_progress, use_cache): (yr, mo)
+            for yr, mo in months
+        }
+        for fut in as_completed(futures):
+            yr, mo = futures[fut]
+            if show_progress:
+                print(f"[build DF] {yr}-{mo:02d} done")
+            df_month = fut.result()
+            if not df_month.empty:
+                results[(yr, mo)] = df_month
+    return results
+
+
+def fetch_statcast_regular_arrow(
+    start_year: int = 2015,
+    end_year: int = 2024,
+    columns: Optional[Sequence[str]] = None,
+    game_type: str = "R",
+    use_cache: bool = True,
+    show_progress: bool = True,
+) -> pa.Table:
+    """Arrow-native variant: concatenating monthly Tables is a pointer splice,
+    not a copy, so peak memory stays ~one month above the final size."""
+    desired_cols = list(columns) if columns is not None else DESIRED_COLS
+    results = _fetch_months(start_year, end_year, desired_cols, game_type,
+                            show_progress, use_cache)
+
+    empty = pa.Table.from_pandas(
+        pd.DataFrame({c: pd.Series(dtype="object") for c in desired_cols}), preserve_index=False
+    )
+    if not results:
+        return empty
+
+    tables = [pa.Table.from_pandas(results[key], preserve_index=False) for key in sorted(results)]
+    return pa.concat_tables(tables, promote_options="permissive")
+
 def fetch_statcast_regular(
     start_year: int = 2015,
     end_year: int = 2024,
@@ -134,44 +280,73 @@ def fetch_statcast_regular(
     show_progress: bool = True,
     min_batter_pa_per_year: Optional[int] = None,
     count_official_ab: bool = False,
+    sink_dir: Optional[str] = None,
 ) -> pd.DataFrame:
-    """Return a pitch-level DataFrame for regular season with optional workload filter."""
-    if use_cache:
-        try:
-            pb_cache.enable()
-        except Exception:
-            pass
-
+    """Return a pitch-level DataFrame for regular season with optional workload filter.
+
+    With `sink_dir` set, each month is streamed into a hive-partitioned
+    parquet dataset as soon as it downloads (memory never holds more than one
+    month) and an empty DataFrame is returned; read the result back with
+    `load_parquet_years(sink_dir)`. The workload filter is unavailable in
+    sink mode because it needs the whole dataset in memory.
+    """
     desired_cols = list(columns) if columns is not None else DESIRED_COLS
 
-    frames: List[pd.DataFrame] = []
-    for yr in range(start_year, end_year + 1):
-        for mo in range(3, 12):  # Mar..Nov
-            if show_progress:
-                print(f"[build DF] {yr}-{mo:02d}")
-            df_month = fetch_month_robust(yr, mo, game_type=game_type, desired_cols=desired_cols, verbose=show_progress)
-            if not df_month.empty:
-                frames.append(df_month)
+    if sink_dir is not None:
+        if min_batter_pa_per_year:
+            raise ValueError("min_batter_pa_per_year is not supported with sink_dir")
+        months = [(yr, mo) for yr in range(start_year, end_year + 1) for mo in range(3, 12)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {
+                pool.submit(fetch_month_robust, yr, mo, game_type, desired_cols,
+                            show_progress, use_cache): (yr, mo)
+                for yr, mo in months
+            }
+            for fut in as_completed(futures):
+                yr, mo = futures[fut]
+                df_month = fut.result()
+                if df_month.empty:
+                    continue
+                pads.write_dataset(
+                    pa.Table.from_pandas(df_month, preserve_index=False),
+                    base_dir=sink_dir, format="parquet",
+                    partitioning=["game_year"], partitioning_flavor="hive",
+                    existing_data_behavior="overwrite_or_ignore",
+                    basename_template=f"{yr}-{mo:02d}-part-{{i}}.parquet",
+                )
+                if show_progress:
+                    print(f"[sink] {yr}-{mo:02d}: {len(df_month):,} rows → {sink_dir}")
+        return pd.DataFrame({c: pd.Series(dtype="object") for c in desired_cols})
 
-    if not frames:
+    table = fetch_statcast_regular_arrow(
+        start_year=start_year, end_year=end_year, columns=desired_cols,
+        game_type=game_type, use_cache=use_cache,
+        show_progress=show_progress,
+    )
+    if table.num_rows == 0:
         return pd.DataFrame({c: pd.Series(dtype="object") for c in desired_cols})
 
-    data = pd.concat(frames, ignore_index=True)
+    # Arrow-backed columns: the concat above was a pointer-splice and this
+    # conversion reuses the same buffers instead of copying into NumPy blocks.
+    data = table.to_pandas(types_mapper=pd.ArrowDtype)
 
     # Optional workload filter (>= threshold PAs or ABs per (year, batter))
     if not min_batter_pa_per_year:
         return data
 
-    # Reduce to one row per PA (last pitch of the at-bat)
+    # Reduce to one row per PA (last pitch of the at-bat) via a per-group
+    # argmax on pitch_number — O(N), instead of a full 4-key sort of the
+    # whole dataset just to pick the last row of each group.
     if "pitch_number" not in data.columns:
         data["pitch_number"] = 0
 
-    reduced = (
-        data.dropna(subset=["game_year", "batter", "game_pk", "at_bat_number"]).
-        sort_values(["game_year", "batter", "game_pk", "at_bat_number", "pitch_number"]).
-        groupby(["game_year", "batter", "game_pk", "at_bat_number"], as_index=False).
-        tail(1)
-    )
+    keys = ["game_year", "batter", "game_pk", "at_bat_number"]
+    sub = data.dropna(subset=keys).copy()
+    for c in keys:
+        sub[c] = sub[c].astype("int32")  # 4-byte keys keep groupby hashing cheap
+    sub["pitch_number"] = sub["pitch_number"].fillna(0)
+    idx = sub.groupby(keys, sort=False)["pitch_number"].idxmax()
+    reduced = data.loc[idx]
 
     if count_official_ab:
         non_ab_events = {"walk", "intent_walk", "hit_by_pitch", "sac_fly", "sac_bunt", "catcher_interference", "catcher_interf"}
@@ -180,14 +355,66 @@ def fetch_statcast_regular(
     else:
         workload = reduced.groupby(["game_year", "batter"]).size()
 
-    eligible_pairs: Set[Tuple[int, int]] = set(workload[workload >= min_batter_pa_per_year].index.tolist())
+    # Vectorized filter: inner-join against the eligible (game_year, batter) pairs
+    # instead of a row-wise apply over millions of pitch rows.
+    eligible = workload[workload >= min_batter_pa_per_year].reset_index()[["game_year", "batter"]]
+    data[["game_year", "batter"]] = data[["game_year", "batter"]].astype("Int64")
+    eligible[["game_year", "batter"]] = eligible[["game_year", "batter"]].astype("Int64")
+    return data.merge(eligible, on=["game_year", "batter"], how="inner").reset_index(drop=True)
 
-    keep_mask = data.apply(
-        lambda r: (int(r.get("game_year")) if pd.notna(r.get("game_year")) else None,
-                   int(r.get("batter")) if pd.notna(r.get("batter")) else None) in eligible_pairs,
-        axis=1
-    )
-    return data.loc[keep_mask].reset_index(drop=True)
+
+# -----------------------------
+# Thin OO wrapper used by the examples/pipeline
+# -----------------------------
+
+class BaseballSavantCollector:
+    """Object-style facade over the module-level fetch helpers.
+
+    Delegates to the robust retry-ladder fetchers above so every caller gets
+    the same caching/retry behavior; keeps the interface the examples expect.
+    """
+
+    #: Canonical column projection — collector and downstream processor agree
+    #: on this schema, and everything outside it is dropped at fetch time.
+    DESIRED_COLS = DESIRED_COLS
+
+    def __init__(self, data_dir: str = "data/raw", use_cache: bool = True):
+        self.data_dir = data_dir
+        self.use_cache = use_cache
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def get_statcast_data(self, start_date: str, end_date: str, game_type: str = "R") -> pd.DataFrame:
+        """Fetch one date window (YYYY-MM-DD strings), projected to DESIRED_COLS."""
+        df = _fetch_window(start_date, end_date, max_retries=3, pause=1.0,
+                           use_cache=self.use_cache)
+        if df is None or df.empty or "game_type" not in df.columns:
+            return pd.DataFrame({c: pd.Series(dtype="object") for c in DESIRED_COLS})
+        df = df[df["game_type"] == game_type]
+        return _compact_dtypes(df.reindex(columns=self.DESIRED_COLS)).reset_index(drop=True)
+
+    def collect_season_data(self, year: int, game_type: str = "R", verbose: bool = True) -> pd.DataFrame:
+        """Fetch a full regular season (Mar..Nov) and persist it as Parquet."""
+        tables: List[pa.Table] = []
+        for mo in range(3, 12):
+            if verbose:
+                print(f"[collect] {year}-{mo:02d}")
+            df_month = fetch_month_robust(year, mo, game_type=game_type,
+                                          verbose=verbose, use_cache=self.use_cache)
+            if not df_month.empty:
+                # Convert immediately so the pandas frame can be released;
+                # the Table list holds the only reference to each month.
+                tables.append(pa.Table.from_pandas(df_month, preserve_index=False))
+
+        if not tables:
+            return pd.DataFrame({c: pd.Series(dtype="object") for c in DESIRED_COLS})
+
+        # Zero-copy splice of the monthly chunks, then one C-level compaction.
+        combined = pa.concat_tables(tables, promote_options="permissive").combine_chunks()
+        fpath = os.path.join(self.data_dir, f"statcast_{year}_raw.parquet")
+        pq.write_table(combined, fpath, compression="zstd")
+        if verbose:
+            print(f"  wrote {combined.num_rows:,} rows → {fpath}")
+        return combined.to_pandas(types_mapper=pd.ArrowDtype)
 
 
 # -----------------------------
@@ -199,39 +426,96 @@ def build_parquet_years(out_dir: str,
                         end_year: int = 2024,
                         use_cache: bool = True,
                         verbose: bool = True) -> None:
-    if use_cache:
-        try:
-            pb_cache.enable()
-        except Exception:
-            pass
-
     os.makedirs(out_dir, exist_ok=True)
 
+    def _build_one(yr: int, mo: int) -> None:
+        df_month = fetch_month_robust(yr, mo, game_type="R", desired_cols=DESIRED_COLS,
+                                      verbose=verbose, use_cache=use_cache)
+        if df_month.empty:
+            if verbose:
+                print(f"  {yr}-{mo:02d}: empty after filtering; nothing written.")
+            return
+        # Sort so row-group min/max statistics are tight for the common
+        # game_year/game_pk range queries, then write into the hive layout
+        # (game_year=YYYY/month=M/...) so readers can prune whole directories.
+        df_month = df_month.sort_values(["game_year", "game_pk", "at_bat_number", "pitch_number"])
+        df_month["month"] = mo
+        pads.write_dataset(
+            pa.Table.from_pandas(df_month, preserve_index=False),
+            base_dir=out_dir, format="parquet",
+            partitioning=["game_year", "month"], partitioning_flavor="hive",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=256_000,
+            file_options=pads.ParquetFileFormat().make_write_options(
+                compression="zstd", use_dictionary=True),
+        )
+        if verbose:
+            print(f"  wrote {len(df_month):,} rows → {out_dir}/game_year={yr}/month={mo}")
+
+    # Pre-filter partitions already on disk so resuming parallelizes trivially.
+    have = _existing_partitions(out_dir)
+    todo = []
     for yr in range(start_year, end_year + 1):
         for mo in range(3, 12):  # Mar..Nov
-            fname = f"statcast_{yr}_{mo:02d}.parquet"
-            fpath = os.path.join(out_dir, fname)
-            if os.path.exists(fpath):
+            if (yr, mo) in have:
                 if verbose:
-                    print(f"[skip] {fname} exists")
+                    print(f"[skip] game_year={yr}/month={mo} exists")
                 continue
+            todo.append((yr, mo))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = {pool.submit(_build_one, yr, mo): (yr, mo) for yr, mo in todo}
+        for fut in as_completed(futures):
+            yr, mo = futures[fut]
             if verbose:
-                print(f"[build] {fname}")
-            df_month = fetch_month_robust(yr, mo, game_type="R", desired_cols=DESIRED_COLS, verbose=verbose)
-            if not df_month.empty:
-                df_month.to_parquet(fpath, index=False)
-                if verbose:
-                    print(f"  wrote {len(df_month):,} rows → {fpath}")
-            else:
-                if verbose:
-                    print("  empty after filtering; nothing written.")
+                print(f"[build] game_year={yr}/month={mo}")
+            fut.result()  # re-raise worker failures
+
+
+def _existing_partitions(out_dir: str) -> set:
+    """Return the {(game_year, month)} pairs already present in the hive layout."""
+    have = set()
+    if not os.path.isdir(out_dir):
+        return have
+    for ydir in os.listdir(out_dir):
+        if not ydir.startswith("game_year="):
+            continue
+        yr = int(ydir.split("=", 1)[1])
+        for mdir in os.listdir(os.path.join(out_dir, ydir)):
+            if mdir.startswith("month="):
+                have.add((yr, int(mdir.split("=", 1)[1])))
+    return have
+
+
+def load_parquet_years(out_dir: str,
+                       years: Optional[Sequence[int]] = None,
+                       batters: Optional[Sequence[int]] = None,
+                       columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """Read the monthly parquet dataset with predicate + column pushdown.
+
+    Filters are pushed down to the hive partition directories and the parquet
+    row-group statistics, so e.g. a single-year query never even opens the
+    other years' files.
+    """
+    ds = pads.dataset(out_dir, format="parquet", partitioning="hive")
+    filt = None
+    if years is not None:
+        filt = pads.field("game_year").isin(list(years))
+    if batters is not None:
+        batter_filt = pads.field("batter").isin(list(batters))
+        filt = batter_filt if filt is None else (filt & batter_filt)
+    return ds.to_table(columns=list(columns) if columns is not None else None, filter=filt)
 
 
 if __name__ == "__main__":
-    # Example 1: Build a single big DataFrame in memory
-    #df = fetch_statcast_regular(2015, 2016, show_progress=True)  # narrow years while testing
-    #print("DF shape:", df.shape)
-    #print(df.head(2))
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build monthly Statcast Parquet files.")
+    parser.add_argument("--out-dir", default="data/parquet/statcast_regular")
+    parser.add_argument("--start-year", type=int, default=2015)
+    parser.add_argument("--end-year", type=int, default=2024)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the pybaseball cache")
+    args = parser.parse_args()
 
-    # Example 2: Or build Parquet files you can query later (recommended for scale)
-    build_parquet_years(out_dir="data/parquet/statcast_regular", start_year=2015, end_year=2024)
\ No newline at end of file
+    build_parquet_years(out_dir=args.out_dir, start_year=args.start_year,
+                        end_year=args.end_year, use_cache=not args.no_cache)
\ No newline at end of file
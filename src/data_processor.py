@@ -0,0 +1,439 @@
+"""
+Data processor for raw Statcast pitch data: cleaning, umpire call
+determination, and per-plate-appearance aggregation.
+
+Feeds the psychological-impact analyzer: each called pitch is classified
+against the rulebook strike zone, then pitches are rolled up into one record
+per plate appearance with incorrect-call counts attached.
+
+Requires: pandas, numpy, duckdb (for Parquet ingestion)
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from db import get_con
+
+# Keep numba's compiled-kernel cache out of the working tree and stable
+# across runs, so only the first-ever run pays the 1-3 s compile cost.
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR", os.path.expanduser("~/.cache/statcast_numba"))
+
+try:  # optional: compiled single-pass PA reduction; pandas path used without it
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+try:  # optional: fused SIMD zone test; plain NumPy comparisons without it
+    import numexpr as ne
+    _HAVE_NUMEXPR = True
+except ImportError:
+    _HAVE_NUMEXPR = False
+
+__all__ = ["StatcastProcessor", "ZONE_HALF_WIDTH"]
+
+# Strike zone half-width at the plate in feet (ball edge at +/- 0.83 covers
+# the plate plus one ball radius, the convention used by Statcast zone work).
+ZONE_HALF_WIDTH = 0.83
+
+# Columns the pipeline consumes, with the called-pitch row filters pushed
+# straight into the parquet scan: only matching row groups are deserialized.
+_RAW_COLUMNS = [
+    "game_date", "batter", "pitcher", "at_bat_number", "pitch_number",
+    "balls", "strikes", "description", "type", "events", "inning",
+    "plate_x", "plate_z", "sz_top", "sz_bot",
+    "woba_value", "estimated_woba_using_speedangle",
+]
+
+_CALLED_PITCH_WHERE = """
+    type IN ('B', 'S')
+      AND description IN ('called_strike', 'ball', 'blocked_ball')
+      AND plate_x IS NOT NULL AND plate_z IS NOT NULL
+      AND sz_top IS NOT NULL AND sz_bot IS NOT NULL
+      AND batter IS NOT NULL AND balls IS NOT NULL AND strikes IS NOT NULL
+"""
+
+_RAW_PARQUET_QUERY = f"""
+    SELECT {', '.join(_RAW_COLUMNS)}
+    FROM read_parquet(?)
+    WHERE {_CALLED_PITCH_WHERE}
+"""
+
+_CALLED_PITCH_REQUIRED = ["plate_x", "plate_z", "sz_top", "sz_bot",
+                          "batter", "balls", "strikes", "description"]
+
+if _HAVE_NUMBA:
+    @njit(cache=True)
+    def _pa_reduce(pa_id, bad, favors):
+        """Walk sorted (pa_id, pitch) arrays once: segment starts/ends,
+        per-PA incorrect-call sums and per-pitch prior counts, all in a
+        single compiled pass with running counters held in registers."""
+        n = pa_id.shape[0]
+        n_groups = 1
+        for i in range(1, n):
+            if pa_id[i] != pa_id[i - 1]:
+                n_groups += 1
+        starts = np.empty(n_groups, dtype=np.int64)
+        ends = np.empty(n_groups, dtype=np.int64)
+        total_bad = np.zeros(n_groups, dtype=np.int32)
+        total_fav = np.zeros(n_groups, dtype=np.int32)
+        prior = np.zeros(n, dtype=np.int16)
+        g = 0
+        starts[0] = 0
+        run_bad = 0
+        run_fav = 0
+        for i in range(n):
+            if i > 0 and pa_id[i] != pa_id[i - 1]:
+                total_bad[g] = run_bad
+                total_fav[g] = run_fav
+                ends[g] = i - 1
+                g += 1
+                starts[g] = i
+                run_bad = 0
+                run_fav = 0
+            prior[i] = run_bad
+            if bad[i]:
+                run_bad += 1
+                if favors[i]:
+                    run_fav += 1
+        total_bad[g] = run_bad
+        total_fav[g] = run_fav
+        ends[g] = n - 1
+        return starts, ends, total_bad, total_fav, prior
+
+
+class StatcastProcessor:
+    """Turns raw pitch-level Statcast data into per-PA records.
+
+    The output is two tables: one row per plate appearance (with outcome,
+    wOBA/xwOBA and incorrect-call counts) and one long-format row per
+    incorrect call, joinable on `pa_id`.
+    """
+
+    def __init__(self, raw_dir: str = "data/raw", processed_dir: str = "data/processed",
+                 con=None):
+        self.raw_dir = raw_dir
+        self.processed_dir = processed_dir
+        # Stages sharing the process-wide connection hand Arrow tables to
+        # each other in memory instead of round-tripping through files.
+        self.con = con if con is not None else get_con()
+        os.makedirs(self.processed_dir, exist_ok=True)
+
+    # -----------------------------
+    # Loading / cleaning
+    # -----------------------------
+
+    def load_raw_data(self, filename: str) -> pd.DataFrame:
+        """Load raw pitches, already filtered down to called pitches.
+
+        Parquet (including globs) goes through DuckDB so the column
+        projection and called-pitch predicates are pushed into the scan —
+        the majority of pitch rows are never materialized. CSV falls back
+        to pandas with the same filters applied after the fact.
+        """
+        path = os.path.join(self.raw_dir, filename)
+        if filename.endswith(".parquet"):
+            # fetch_arrow_table, not .arrow(): duckdb >= 1.4 returns a
+            # RecordBatchReader from .arrow(), which has no to_pandas.
+            table = self.con.execute(_RAW_PARQUET_QUERY, [path]).fetch_arrow_table()
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+        df = pd.read_csv(path)
+        mask = (
+            df["type"].isin(["B", "S"])
+            & df["description"].isin(["called_strike", "ball", "blocked_ball"])
+            & df[_CALLED_PITCH_REQUIRED].notna().all(axis=1)
+        )
+        return df.loc[mask]
+
+    def stream_raw_to_table(self, filename: str, table_name: str = "pitches_clean",
+                            batch_size: int = 500_000) -> int:
+        """Stream a raw parquet file into a DuckDB table without ever holding
+        the full season in memory.
+
+        Reads Arrow record batches of `batch_size` rows, applies the
+        called-pitch filter to each, and appends the survivors to
+        `table_name` on the shared connection. Peak RSS is bounded by one
+        batch (tens of MB) regardless of how many seasons the file holds,
+        where load_raw_data materializes the whole filtered frame. Returns
+        the row count of the rebuilt table.
+        """
+        path = os.path.join(self.raw_dir, filename)
+        pf = pq.ParquetFile(path)
+        available = set(pf.schema_arrow.names)
+        cols = [c for c in _RAW_COLUMNS if c in available]
+        batch_query = (
+            f"SELECT {', '.join(cols)} FROM _raw_batch WHERE {_CALLED_PITCH_WHERE}"
+        )
+        self.con.execute(f"DROP TABLE IF EXISTS {table_name}")
+        created = False
+        for batch in pf.iter_batches(batch_size=batch_size, columns=cols):
+            self.con.register("_raw_batch", pa.Table.from_batches([batch]))
+            if created:
+                self.con.execute(f"INSERT INTO {table_name} {batch_query}")
+            else:
+                self.con.execute(f"CREATE TABLE {table_name} AS {batch_query}")
+                created = True
+            self.con.unregister("_raw_batch")
+        if not created:
+            self.con.execute(
+                f"CREATE TABLE {table_name} AS "
+                f"SELECT {', '.join(cols)} FROM read_parquet(?) WHERE 1 = 0", [path])
+        return self.con.execute(f"SELECT count(*) FROM {table_name}").fetchone()[0]
+
+    # Low-cardinality strings become categoricals so later filters, equality
+    # tests and groupbys run on small integer codes instead of per-cell strings.
+    _CATEGORY_COLS = ("type", "description", "events", "stand", "p_throws")
+    _INT_CASTS = {"batter": "Int32", "pitcher": "Int32", "inning": "Int16",
+                  "balls": "Int8", "strikes": "Int8",
+                  "pitch_number": "Int8", "at_bat_number": "Int16"}
+    # Location/zone measurements: Statcast reports ~2-3 decimal places of
+    # real precision, well inside float32's 7, and halving the bytes halves
+    # the memory bandwidth of every zone-test pass. The wOBA columns stay
+    # float64 — they feed season-level means where accumulated float32
+    # rounding would show up in the third decimal.
+    _FLOAT32_COLS = ("plate_x", "plate_z", "sz_top", "sz_bot")
+
+    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Coerce dtypes in place; called-pitch row filtering happens at load time.
+
+        The frame it receives is pipeline-internal (freshly materialized by
+        load_raw_data), so no defensive copy is taken.
+        """
+        # Parquet-sourced frames arrive with a real date/timestamp column; only
+        # CSV-sourced strings need parsing, and the fixed format takes the C
+        # fast path instead of per-row dateutil inference.
+        game_date = df["game_date"]
+        if pd.api.types.is_object_dtype(game_date) or pd.api.types.is_string_dtype(game_date):
+            df["game_date"] = pd.to_datetime(game_date, format="%Y-%m-%d", cache=True)
+        elif not pd.api.types.is_datetime64_any_dtype(game_date):
+            df["game_date"] = pd.to_datetime(game_date)
+        for c in self._CATEGORY_COLS:
+            if c in df.columns:
+                df[c] = df[c].astype("category")
+        for c in self._FLOAT32_COLS:
+            if c in df.columns:
+                target = (pd.ArrowDtype(pa.float32())
+                          if isinstance(df[c].dtype, pd.ArrowDtype) else np.float32)
+                df[c] = df[c].astype(target)
+        df = df.astype({c: t for c, t in self._INT_CASTS.items() if c in df.columns})
+        return df
+
+    # -----------------------------
+    # Call classification
+    # -----------------------------
+
+    def determine_correct_call(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Classify each called pitch as correct/incorrect against the rulebook zone.
+
+        One boolean-kernel pass: a call is correct exactly when
+        strike-called == in-zone, so `correct_call` is a single equality over
+        two bool arrays instead of an np.select over multiple masks.
+        `call_favors_batter` is nullable boolean (pd.NA on correct calls,
+        True when a real strike was called a ball). Columns are added to the
+        input frame directly — callers pass pipeline-internal frames, so the
+        full-frame copy would be a pure memcpy tax.
+        """
+        # On the parquet path the location columns are Arrow-backed; run the
+        # zone comparisons as SIMD Arrow compute kernels directly over those
+        # buffers instead of round-tripping through pandas/NumPy temporaries.
+        if isinstance(df["plate_x"].dtype, pd.ArrowDtype):
+            px = pa.array(df["plate_x"], from_pandas=True)
+            pz = pa.array(df["plate_z"], from_pandas=True)
+            in_zone = pc.and_(
+                pc.and_(pc.greater_equal(px, -ZONE_HALF_WIDTH),
+                        pc.less_equal(px, ZONE_HALF_WIDTH)),
+                pc.and_(pc.greater_equal(pz, pa.array(df["sz_bot"], from_pandas=True)),
+                        pc.less_equal(pz, pa.array(df["sz_top"], from_pandas=True))),
+            ).to_numpy(zero_copy_only=False).astype(bool)
+        elif _HAVE_NUMEXPR:
+            # numexpr fuses the four comparisons into one SIMD pass over the
+            # float columns; no intermediate boolean temporaries.
+            in_zone = ne.evaluate(
+                "(px >= -hw) & (px <= hw) & (pz >= szb) & (pz <= szt)",
+                local_dict={"px": df["plate_x"].to_numpy(),
+                            "pz": df["plate_z"].to_numpy(),
+                            "szb": df["sz_bot"].to_numpy(),
+                            "szt": df["sz_top"].to_numpy(),
+                            "hw": ZONE_HALF_WIDTH},
+            )
+        else:
+            in_zone = (
+                df["plate_x"].between(-ZONE_HALF_WIDTH, ZONE_HALF_WIDTH)
+                & df["plate_z"].between(df["sz_bot"], df["sz_top"])
+            ).to_numpy(dtype=bool)
+        is_strike_call = (df["description"] == "called_strike").to_numpy(dtype=bool)
+
+        correct_call = is_strike_call == in_zone
+        favors_batter = pd.array(~correct_call & ~is_strike_call, dtype="boolean")
+        favors_batter[correct_call] = pd.NA
+
+        df["in_zone"] = in_zone
+        df["correct_call"] = correct_call
+        df["call_favors_batter"] = favors_batter
+        return df
+
+    # -----------------------------
+    # Plate-appearance grouping / aggregation
+    # -----------------------------
+
+    def create_plate_appearance_groups(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Tag each pitch with an integer `pa_id` and order pitches within each PA.
+
+        The id packs (game_date, batter, at_bat_number) into a single int64
+        (epoch days << 40 | batter << 16 | at_bat_number), so every downstream
+        groupby hashes one 8-byte key instead of a concatenated string per
+        row. Batter ids fit comfortably in 24 bits and at-bat numbers in 16.
+        """
+        df = df.copy()
+        days = df["game_date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+        batter = df["batter"].astype(np.int64).to_numpy()
+        at_bat = df["at_bat_number"].astype(np.int64).to_numpy()
+        df["pa_id"] = (days << 40) | (batter << 16) | at_bat
+        # pa_id already encodes (date, batter, at_bat) in order, so one lexsort
+        # over two contiguous int buffers replaces the old multi-key
+        # mixed-dtype sort_values.
+        order = np.lexsort((
+            df["pitch_number"].to_numpy(dtype=np.int64, na_value=-1),
+            df["pa_id"].to_numpy(),
+        ))
+        return df.iloc[order]
+
+    def calculate_pa_metrics(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Aggregate pitch rows into one record per plate appearance.
+
+        With numba available the whole reduction — segment detection, prior
+        counts and every per-PA sum — is one compiled pass over the sorted
+        arrays; otherwise a vectorized groupby path produces the same tables.
+        Outcome fields (events, wOBA, xwOBA) take the last *non-null* value
+        within the PA on both paths: the called-pitch filter can leave the
+        positionally last pitch with null outcomes, and discarding an
+        earlier populated value would lose the PA's result. Incorrect-call
+        details come back as a separate long-format frame (one row per bad
+        call) rather than nested dicts, so consumers can merge on `pa_id`.
+        """
+        # create_plate_appearance_groups already emits (pa_id, pitch_number)
+        # order; an O(n) monotonicity check replaces the unconditional
+        # O(n log n) re-sort, which only runs for out-of-pipeline callers.
+        ids = df["pa_id"].to_numpy()
+        pn = df["pitch_number"].to_numpy(dtype=np.int64, na_value=-1)
+        ordered = bool(np.all(
+            (ids[1:] > ids[:-1]) | ((ids[1:] == ids[:-1]) & (pn[1:] >= pn[:-1]))
+        ))
+        if not ordered:
+            df = df.sort_values(["pa_id", "pitch_number"], kind="stable")
+        bad = ~df["correct_call"].astype(bool)
+        favors_bat = (df["call_favors_batter"] == True).fillna(False)  # noqa: E712 (NA-safe)
+        df = df.assign(bad=bad, favors_bat=favors_bat)
+
+        if _HAVE_NUMBA and len(df):
+            # Single compiled pass over the sorted arrays: segment detection,
+            # prior counts and all per-PA sums together, no group dispatch.
+            starts, ends, total_bad, total_fav, prior = _pa_reduce(
+                df["pa_id"].to_numpy(),
+                df["bad"].to_numpy(dtype=bool),
+                df["favors_bat"].to_numpy(dtype=bool),
+            )
+            df["prior_incorrect_calls"] = prior
+            firsts = df.iloc[starts]
+
+            # Last non-null per segment (the fallback's agg("last")
+            # semantics): candidate index where valid else -1, then a
+            # segment max via reduceat; -1 segments stay null.
+            idx = np.arange(len(df), dtype=np.int64)
+
+            def _last_valid(col: str) -> pd.Series:
+                cand = np.where(df[col].notna().to_numpy(), idx, -1)
+                last_idx = np.maximum.reduceat(cand, starts)
+                picked = df[col].iloc[np.maximum(last_idx, 0)]
+                return picked.reset_index(drop=True).mask(last_idx < 0)
+
+            pa_df = pd.DataFrame({
+                "pa_id": firsts["pa_id"].to_numpy(),
+                "batter": firsts["batter"].to_numpy(),
+                "game_date": firsts["game_date"].to_numpy(),
+                "pitcher": firsts["pitcher"].to_numpy(),
+                "inning": firsts["inning"].to_numpy(),
+                "at_bat_number": firsts["at_bat_number"].to_numpy(),
+                "events": _last_valid("events"),
+                "woba_value": _last_valid("woba_value"),
+                "estimated_woba_using_speedangle":
+                    _last_valid("estimated_woba_using_speedangle"),
+                "total_pitches": np.diff(np.append(starts, len(df))),
+                "total_incorrect_calls": total_bad,
+                "incorrect_calls_favoring_batter": total_fav,
+            })
+        else:
+            # Vectorized pandas fallback: grouped running total minus the
+            # pitch's own contribution, then one groupby.agg.
+            df["prior_incorrect_calls"] = (
+                df.groupby("pa_id", sort=False)["bad"].cumsum() - bad.astype("int8")
+            )
+            pa_df = df.groupby("pa_id", sort=False, observed=True).agg(
+                batter=("batter", "first"),
+                game_date=("game_date", "first"),
+                pitcher=("pitcher", "first"),
+                inning=("inning", "first"),
+                at_bat_number=("at_bat_number", "first"),
+                events=("events", "last"),
+                woba_value=("woba_value", "last"),
+                estimated_woba_using_speedangle=("estimated_woba_using_speedangle", "last"),
+                total_pitches=("pitch_number", "size"),
+                total_incorrect_calls=("bad", "sum"),
+                incorrect_calls_favoring_batter=("favors_bat", "sum"),
+            ).reset_index()
+
+        bad_calls_df = df.loc[bad, [
+            "pa_id", "batter", "pitch_number", "balls", "strikes",
+            "description", "in_zone", "call_favors_batter", "prior_incorrect_calls",
+        ]].reset_index(drop=True)
+
+        return pa_df, bad_calls_df
+
+    def filter_qualified_batters(self, pa_df: pd.DataFrame, min_pa: int = 300) -> pd.DataFrame:
+        """Keep only batters with at least `min_pa` plate appearances."""
+        # Count and mask on plain int64 arrays: np.isin against the sorted
+        # qualified ids is much faster than value_counts + Index.isin.
+        batters = pa_df["batter"].to_numpy(dtype="int64", na_value=-1)
+        uniq, counts = np.unique(batters, return_counts=True)
+        mask = np.isin(batters, uniq[counts >= min_pa])
+        return pa_df[mask]
+
+    # -----------------------------
+    # Full pipeline
+    # -----------------------------
+
+    def process_full_dataset(self, input_filename: str,
+                             output_filename: Optional[str] = None,
+                             min_pa: int = 300) -> pd.DataFrame:
+        """Run clean -> call classification -> PA aggregation and persist results.
+
+        Writes the PA table to `output_filename` (if given) and the
+        incorrect-call detail table alongside it with a `_bad_calls` suffix.
+        Output is always zstd parquet — the categorical columns land
+        dictionary-encoded and downstream readers get predicate pushdown —
+        so any extension on `output_filename` is replaced with `.parquet`.
+        """
+        raw_df = self.load_raw_data(input_filename)
+        clean_df = self.clean_data(raw_df)
+        called_df = self.determine_correct_call(clean_df)
+        grouped_df = self.create_plate_appearance_groups(called_df)
+        pa_df, bad_calls_df = self.calculate_pa_metrics(grouped_df)
+        pa_df = self.filter_qualified_batters(pa_df, min_pa=min_pa)
+
+        if output_filename:
+            stem = os.path.splitext(os.path.join(self.processed_dir, output_filename))[0]
+            pa_df.to_parquet(f"{stem}.parquet", engine="pyarrow",
+                             compression="zstd", row_group_size=200_000)
+            bad_calls_df.to_parquet(f"{stem}_bad_calls.parquet", engine="pyarrow",
+                                    compression="zstd", row_group_size=200_000)
+
+        return pa_df
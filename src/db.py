@@ -0,0 +1,25 @@
+"""
+Shared DuckDB connection for the pipeline.
+
+Every stage (collection, processing, analysis, reporting) that talks to
+DuckDB should go through `get_con()` so intermediate results stay in one
+process's Arrow buffers — tables registered or created by one stage are
+readable by the next with zero-copy handoff, no CSV/Parquet round-trip.
+
+Requires: duckdb
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+import duckdb
+
+DB_PATH = "statcast.duckdb"
+
+__all__ = ["DB_PATH", "get_con"]
+
+
+@lru_cache(maxsize=None)
+def get_con(db_path: str = DB_PATH) -> duckdb.DuckDBPyConnection:
+    """Process-wide DuckDB connection (one per database path)."""
+    return duckdb.connect(db_path)
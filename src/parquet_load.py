@@ -7,37 +7,154 @@ pip install duckdb pyarrow
 from __future__ import annotations
 
 import os
-import duckdb as ddb
 
-PARQUET_GLOB = "data/parquet/statcast_regular/statcast_*.parquet"
-DB_PATH = "statcast.duckdb"  # local embedded DB file
+from db import DB_PATH, get_con
+
+# build_parquet_years writes a hive layout (game_year=YYYY/month=M/...) with
+# zstd, dictionary encoding, and row-group statistics; the recursive glob plus
+# hive_partitioning lets DuckDB prune whole directories on game_year/month
+# predicates and skip row groups on game_date/batter/description ones.
+# The recursive glob also matches the legacy flat statcast_*.parquet files, so
+# after rebuilding into the hive layout the flat files must be removed —
+# otherwise the view unions two incompatible schemas (ensure_data_exists
+# refuses to run on such a mix).
+PARQUET_GLOB = "data/parquet/statcast_regular/**/*.parquet"
+
+# Mirrors StatcastProcessor: called pitches judged against the rulebook zone,
+# rolled up to one row per plate appearance. Runs entirely inside DuckDB's
+# vectorized, multi-threaded executor — no pandas intermediates. pa_id uses
+# the same (epoch_days << 40 | batter << 16 | at_bat_number) packing as
+# data_processor.create_plate_appearance_groups.
+PA_VIEWS_SQL = """
+    CREATE OR REPLACE VIEW pitches_judged AS
+    WITH called AS (
+        SELECT *,
+               (plate_x BETWEEN -0.83 AND 0.83
+                AND plate_z BETWEEN sz_bot AND sz_top) AS in_zone,
+               (description = 'called_strike') AS is_strike_call
+        FROM pitches
+        WHERE type IN ('B', 'S')
+          AND description IN ('called_strike', 'ball', 'blocked_ball')
+          AND plate_x IS NOT NULL AND plate_z IS NOT NULL
+          AND sz_top IS NOT NULL AND sz_bot IS NOT NULL
+          AND batter IS NOT NULL
+    )
+    SELECT *,
+           (is_strike_call = in_zone) AS correct_call,
+           (is_strike_call <> in_zone AND NOT is_strike_call) AS call_favors_batter,
+           (CAST(date_diff('day', DATE '1970-01-01', CAST(game_date AS DATE)) AS BIGINT) << 40)
+               | (CAST(batter AS BIGINT) << 16)
+               | CAST(at_bat_number AS BIGINT) AS pa_id
+    FROM called;
+
+    CREATE OR REPLACE VIEW pa AS
+    SELECT pa_id,
+           any_value(batter) AS batter,
+           any_value(game_date) AS game_date,
+           any_value(pitcher) AS pitcher,
+           any_value(inning) AS inning,
+           any_value(at_bat_number) AS at_bat_number,
+           -- Ordering null rows first makes last() pick the last *non-null*
+           -- value (DuckDB's last() does not skip NULLs on its own), matching
+           -- calculate_pa_metrics' outcome semantics.
+           last(events ORDER BY (events IS NOT NULL), pitch_number) AS events,
+           last(woba_value ORDER BY (woba_value IS NOT NULL), pitch_number)
+               AS woba_value,
+           last(estimated_woba_using_speedangle
+                ORDER BY (estimated_woba_using_speedangle IS NOT NULL), pitch_number)
+               AS estimated_woba_using_speedangle,
+           count(*) AS total_pitches,
+           sum(CASE WHEN NOT correct_call THEN 1 ELSE 0 END) AS total_incorrect_calls,
+           sum(CASE WHEN NOT correct_call AND call_favors_batter THEN 1 ELSE 0 END)
+               AS incorrect_calls_favoring_batter
+    FROM pitches_judged
+    GROUP BY pa_id;
+"""
+
+# Columns the views above require beyond what the pre-DESIRED_COLS datasets
+# carried; datasets built before the column-set widening lack them.
+_PA_VIEW_COLUMNS = ("game_date", "sz_top", "sz_bot", "woba_value")
+
+
+def ensure_pitch_columns(con) -> None:
+    """Fail with a rebuild hint if the pitches view predates the PA schema.
+
+    Without the guard, creating the views dies in DuckDB's binder with an
+    unhelpful column-not-found error.
+    """
+    have = {row[0] for row in con.execute("DESCRIBE pitches").fetchall()}
+    missing = [c for c in _PA_VIEW_COLUMNS if c not in have]
+    if missing:
+        raise SystemExit(
+            f"Parquet dataset is missing column(s) {', '.join(missing)} "
+            f"needed by the plate-appearance views.\n"
+            f"Rebuild it with build_parquet_years(...) from data_collector.py "
+            f"(the current DESIRED_COLS include them)."
+        )
 
 
 def ensure_data_exists() -> None:
-    pattern_root = os.path.dirname(PARQUET_GLOB)
+    # The glob components are not real directories; the dataset root is
+    # everything before the first wildcard.
+    pattern_root = PARQUET_GLOB.split("*", 1)[0].rstrip("/")
     if not os.path.isdir(pattern_root):
         raise SystemExit(
             f"Parquet folder not found: {pattern_root}.\n"
             f"Run build_parquet_years(...) from data_collector.py first."
         )
+    entries = os.listdir(pattern_root)
+    has_flat = any(e.endswith(".parquet") for e in entries)
+    has_hive = any(e.startswith("game_year=") for e in entries)
+    if has_flat and has_hive:
+        raise SystemExit(
+            f"{pattern_root} mixes flat statcast_*.parquet files with the "
+            f"hive game_year=*/ layout; the view would union incompatible "
+            f"schemas. Remove the flat files after rebuilding."
+        )
+
+
+def materialize_pa(con) -> int:
+    """Persist the pa view as a pa_processed table inside the database file.
+
+    Inserts only plate appearances from game dates newer than what the table
+    already holds, so re-running the loader after adding a new month of
+    parquet does incremental work instead of recomputing every season.
+    Returns the number of rows now in pa_processed.
+    """
+    con.execute("CREATE TABLE IF NOT EXISTS pa_processed AS SELECT * FROM pa WHERE 1 = 0")
+    con.execute("""
+        INSERT INTO pa_processed
+        SELECT * FROM pa
+        WHERE game_date > (SELECT coalesce(max(game_date), TIMESTAMP '1900-01-01')
+                           FROM pa_processed)
+    """)
+    return con.execute("SELECT count(*) FROM pa_processed").fetchone()[0]
 
 
 def main() -> None:
     ensure_data_exists()
-    con = ddb.connect(DB_PATH)
+    con = get_con(DB_PATH)
 
-    # Create/replace a view over all Parquet files (partition pruning by filename is automatic)
+    # View over the partitioned dataset. Queries that mention game_year or
+    # month in WHERE are answered without opening the other partitions.
     con.execute(f"""
         CREATE OR REPLACE VIEW pitches AS
-        SELECT * FROM read_parquet('{PARQUET_GLOB}');
+        SELECT * FROM read_parquet('{PARQUET_GLOB}', hive_partitioning = 1);
     """)
 
+    # Derived views: judged called pitches and the one-row-per-PA rollup
+    # (guarded so an old dataset fails with a rebuild hint, not a binder error)
+    ensure_pitch_columns(con)
+    con.execute(PA_VIEWS_SQL)
+
+    # Persist the rollup; only dates newer than the stored max are inserted
+    n_pa = materialize_pa(con)
+    print(f"pa_processed rows: {n_pa}")
+
     # Quick sanity query: first two rows
     df_preview = con.execute("SELECT * FROM pitches LIMIT 2").df()
     print(df_preview)
 
-    # (Optional) You can add more derived views here, e.g. one row per PA, eligible batters, etc.
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
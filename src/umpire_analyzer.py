@@ -0,0 +1,415 @@
+"""
+Umpire impact analyzer: quantifies how incorrect calls against a batter
+depress subsequent performance, and projects the xwOBA a batter would
+recover under automated ball-strike calling.
+
+Consumes the processor's two tables — one row per plate appearance and the
+long-format incorrect-call detail (`*_bad_calls.parquet`) — and produces
+`reports/undervalued_targets.parquet` (with a CSV copy for external
+consumers) plus `reports/scouting_report.json` for the report generator.
+
+Requires: pandas, numpy
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+
+try:  # optional: fused elementwise scoring math; plain NumPy without it
+    import numexpr as ne
+    _HAVE_NUMEXPR = True
+except ImportError:
+    _HAVE_NUMEXPR = False
+
+__all__ = ["UmpireImpactAnalyzer"]
+
+# Minimum sample sizes before a batter's decline is considered measurable.
+MIN_CLEAN_PAS = 50
+MIN_POST_CALL_PAS = 20
+
+# How many subsequent plate appearances a bad call is assumed to echo into.
+POST_CALL_WINDOW = 10
+
+
+class UmpireImpactAnalyzer:
+    """Measures post-bad-call performance decline per batter.
+
+    The analysis compares each batter's baseline (plate appearances with no
+    incorrect call against them) to their performance in the
+    `POST_CALL_WINDOW` plate appearances following a call against them.
+    """
+
+    def __init__(self, processed_dir: str = "data/processed",
+                 reports_dir: str = "reports"):
+        self.processed_dir = processed_dir
+        self.reports_dir = reports_dir
+        os.makedirs(self.reports_dir, exist_ok=True)
+
+    # -----------------------------
+    # Loading
+    # -----------------------------
+
+    def load_processed_data(self, filename: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Load the PA table and its long-format bad-call sibling.
+
+        The processor writes zstd parquet; any extension on `filename` is
+        replaced the same way `process_full_dataset` does, so callers can
+        keep passing the historical `.csv` names.
+        """
+        stem = os.path.splitext(os.path.join(self.processed_dir, filename))[0]
+        pa_df = pd.read_parquet(
+            f"{stem}.parquet", engine="pyarrow",
+            columns=["pa_id", "batter", "game_date", "woba_value",
+                     "estimated_woba_using_speedangle",
+                     "total_incorrect_calls", "incorrect_calls_favoring_batter"])
+        bad_calls_df = pd.read_parquet(
+            f"{stem}_bad_calls.parquet", engine="pyarrow",
+            columns=["pa_id", "batter", "pitch_number",
+                     "description", "call_favors_batter"])
+        # Half the bytes per pass through the hot columns: wOBA values fit
+        # float32 with precision to spare, batter ids fit int32, and the
+        # count columns fit int16. pa_id stays int64 — it packs
+        # (epoch_days << 40 | batter << 16 | at_bat) and would overflow
+        # anything narrower.
+        # Parquet delivers game_date as datetime64 already; the guard only
+        # fires for tables written by other tools, and the fixed format
+        # takes the C fast path once for the whole column. Downstream day
+        # gaps are then a single vectorized datetime subtraction.
+        if not pd.api.types.is_datetime64_any_dtype(pa_df["game_date"]):
+            pa_df["game_date"] = pd.to_datetime(
+                pa_df["game_date"], format="%Y-%m-%d", cache=True)
+        pa_df = pa_df.astype({
+            "woba_value": "float32",
+            "estimated_woba_using_speedangle": "float32",
+            "batter": "int32",
+            "total_incorrect_calls": "int16",
+            "incorrect_calls_favoring_batter": "int16",
+        }, errors="ignore")
+        bad_calls_df = bad_calls_df.astype({"batter": "int32"}, errors="ignore")
+        # batter keys every groupby and merge below; one shared categorical
+        # dtype makes those operate on the small integer codes instead of
+        # hashing ids per operation (all groupbys pass observed=True so
+        # unseen codes don't fan out into empty groups).
+        batter_dtype = pd.CategoricalDtype(np.unique(pa_df["batter"].to_numpy()))
+        pa_df["batter"] = pa_df["batter"].astype(batter_dtype)
+        bad_calls_df["batter"] = bad_calls_df["batter"].astype(batter_dtype)
+        return pa_df, bad_calls_df
+
+    # -----------------------------
+    # Bad-call extraction
+    # -----------------------------
+
+    def analyze_post_call_performance(self, pa_df: pd.DataFrame,
+                                      bad_calls_df: pd.DataFrame) -> pd.DataFrame:
+        """One row per incorrect call *against* the batter, with PA context.
+
+        The processor already emits bad calls in long format — one row per
+        call, not nested per-PA lists — so this is pure columnar work: a
+        boolean filter for calls against the batter, one merge to attach
+        the PA's date and outcome, and vectorized flags. No per-row Python.
+        """
+        against = bad_calls_df[bad_calls_df["call_favors_batter"] != True]  # noqa: E712 (NA-safe)
+        calls_df = against.merge(
+            pa_df[["pa_id", "batter", "game_date",
+                   "woba_value", "estimated_woba_using_speedangle"]],
+            on=["pa_id", "batter"], how="inner",
+        )
+        # A call against the batter is, by construction, a ball called a
+        # strike; keep both flags explicit for downstream consumers.
+        strike_call = calls_df["description"].astype(str) == "called_strike"
+        calls_df["was_ball_called_strike"] = strike_call.to_numpy(dtype=bool)
+        calls_df["was_strike_called_ball"] = ~calls_df["was_ball_called_strike"]
+        return calls_df
+
+    # -----------------------------
+    # Baseline
+    # -----------------------------
+
+    def calculate_baseline_performance(self, pa_df: pd.DataFrame) -> pd.DataFrame:
+        """Per-batter baseline from plate appearances with no call against them.
+
+        The PA table already carries per-PA incorrect-call counts, so a
+        clean PA is simply one where every incorrect call (if any) favored
+        the batter.
+        """
+        clean_df = pa_df[pa_df["total_incorrect_calls"]
+                         == pa_df["incorrect_calls_favoring_batter"]]
+        baseline = clean_df.groupby("batter", sort=False, observed=True).agg(
+            baseline_woba_mean=("woba_value", "mean"),
+            baseline_woba_std=("woba_value", "std"),
+            baseline_xwoba_mean=("estimated_woba_using_speedangle", "mean"),
+            clean_pa_count=("pa_id", "size"),
+        ).reset_index()
+        return baseline[baseline["clean_pa_count"] >= MIN_CLEAN_PAS]
+
+    # -----------------------------
+    # Post-bad-call windows
+    # -----------------------------
+
+    def analyze_performance_after_bad_calls(self, pa_df: pd.DataFrame,
+                                            calls_df: pd.DataFrame) -> pd.DataFrame:
+        """Collect the PAs inside each bad call's echo window.
+
+        Returns one row per plate appearance inside a window, attributed to
+        the most recent bad call preceding it, with its offset within the
+        window and days elapsed since the call.
+
+        Implemented as two C-level passes: a grouped cumcount assigns each
+        PA its per-batter position, then a backward merge_asof joins every
+        PA to the nearest preceding bad call for that batter. Offsets fall
+        out as rank differences and the day gap is one vectorized datetime
+        subtraction. Attributing each PA to its nearest preceding call also
+        means overlapping windows no longer double-count a PA.
+        """
+        # Convention: pa_df arrives sorted by (batter, pa_id) —
+        # run_full_analysis sorts once up front, so no re-sort here. The
+        # check is O(n) and stripped under -O. The narrow column selection
+        # also keeps pa_rank off the caller's frame.
+        assert pa_df.groupby("batter", sort=False, observed=True)[
+            "pa_id"].is_monotonic_increasing.all(), \
+            "pa_df must be pre-sorted by (batter, pa_id)"
+        df_sorted = pa_df[["pa_id", "batter", "game_date",
+                           "woba_value", "estimated_woba_using_speedangle"]]
+        df_sorted = df_sorted.assign(
+            pa_rank=df_sorted.groupby("batter", sort=False, observed=True).cumcount())
+
+        calls_ranked = (
+            calls_df.drop_duplicates(["batter", "pa_id"])
+            .merge(df_sorted[["pa_id", "batter", "pa_rank"]],
+                   on=["pa_id", "batter"], how="inner")
+            [["batter", "pa_id", "pa_rank", "game_date"]]
+            .rename(columns={"pa_id": "bad_call_pa_id",
+                             "pa_rank": "bad_call_rank",
+                             "game_date": "bad_call_date"})
+        )
+        if calls_ranked.empty:
+            return pd.DataFrame()
+
+        # pa_id is globally sortable and monotonic within each batter, so
+        # one global sort satisfies merge_asof for every by-group at once.
+        merged = pd.merge_asof(
+            df_sorted.sort_values("pa_id"),
+            calls_ranked.sort_values("bad_call_pa_id"),
+            by="batter", left_on="pa_id", right_on="bad_call_pa_id",
+            direction="backward", allow_exact_matches=False,
+        )
+        merged = merged.dropna(subset=["bad_call_pa_id"])
+
+        offsets = (merged["pa_rank"] - merged["bad_call_rank"]).astype("int64")
+        merged["pas_after_bad_call"] = offsets
+        merged = merged[(offsets >= 1) & (offsets <= POST_CALL_WINDOW)].copy()
+        merged["days_since_bad_call"] = (
+            merged["game_date"] - merged["bad_call_date"]).dt.days
+        merged["bad_call_pa_id"] = merged["bad_call_pa_id"].astype("int64")
+
+        return merged[["batter", "bad_call_pa_id", "pa_id",
+                       "pas_after_bad_call", "days_since_bad_call",
+                       "woba_value", "estimated_woba_using_speedangle"]
+                      ].reset_index(drop=True)
+
+    # -----------------------------
+    # Impact scoring
+    # -----------------------------
+
+    def calculate_psychological_impact_scores(self, baseline_df: pd.DataFrame,
+                                              impact_df: pd.DataFrame,
+                                              calls_df: pd.DataFrame) -> pd.DataFrame:
+        """Merge baseline vs post-bad-call aggregates into per-batter scores."""
+        if impact_df.empty:
+            return pd.DataFrame()
+
+        # One hash-group pass over the window table produces every post-call
+        # statistic at once.
+        post = impact_df.groupby("batter", sort=False, observed=True).agg(
+            post_bad_call_woba_mean=("woba_value", "mean"),
+            post_bad_call_woba_std=("woba_value", "std"),
+            post_bad_call_xwoba_mean=("estimated_woba_using_speedangle", "mean"),
+            post_bad_call_count=("pa_id", "size"),
+        ).reset_index()
+        # calls_df is already one row per bad call, so a plain size() counts
+        # them without the per-group set construction nunique pays on the
+        # (much larger) window table — and season-ending calls with no
+        # subsequent PA now count too.
+        bad_call_counts = (
+            calls_df.groupby("batter", sort=False, observed=True).size()
+            .rename("total_bad_calls_experienced").reset_index()
+        )
+
+        merged_df = (baseline_df.merge(post, on="batter")
+                     .merge(bad_call_counts, on="batter"))
+        merged_df = merged_df[merged_df["post_bad_call_count"] >= MIN_POST_CALL_PAS]
+        if merged_df.empty:
+            return merged_df
+
+        # Pull each column into a NumPy array once; the scoring chain is
+        # pure elementwise math over these six, so with numexpr available
+        # each derived column is a single fused, cache-blocked pass instead
+        # of one materialized intermediate per operator.
+        aw = merged_df["baseline_woba_mean"].to_numpy(dtype=np.float64)
+        bw = merged_df["post_bad_call_woba_mean"].to_numpy(dtype=np.float64)
+        a = merged_df["baseline_xwoba_mean"].to_numpy(dtype=np.float64)
+        b = merged_df["post_bad_call_xwoba_mean"].to_numpy(dtype=np.float64)
+        n1 = merged_df["clean_pa_count"].to_numpy(dtype=np.float64)
+        n2 = merged_df["post_bad_call_count"].to_numpy(dtype=np.float64)
+
+        woba_decline = aw - bw
+        merged_df["woba_decline_after_bad_calls"] = woba_decline
+        merged_df["xwoba_decline_after_bad_calls"] = a - b
+
+        # Season estimate blends clean and post-call windows by exposure;
+        # a robo-ump season is all-baseline by definition.
+        if _HAVE_NUMEXPR:
+            env = {"a": a, "b": b, "n1": n1, "n2": n2}
+            pct_affected = ne.evaluate("100 * n2 / (n1 + n2)", local_dict=env)
+            current_est = ne.evaluate("(a * n1 + b * n2) / (n1 + n2)",
+                                      local_dict=env)
+            projected = ne.evaluate("(a - b) * (n2 / (n1 + n2))",
+                                    local_dict=env)
+        else:
+            post_share = n2 / (n1 + n2)
+            pct_affected = post_share * 100
+            current_est = a * (1 - post_share) + b * post_share
+            projected = (a - b) * post_share
+        merged_df["pct_pas_affected_by_bad_calls"] = pct_affected
+        merged_df["current_season_xwoba_estimate"] = current_est
+        merged_df["robo_ump_xwoba_estimate"] = a
+        merged_df["projected_xwoba_improvement"] = projected
+
+        # Columnar t-stat: whole-column ufuncs with np.where gating the
+        # undersampled/degenerate rows to NaN — no per-row apply.
+        s1 = merged_df["baseline_woba_std"].to_numpy(dtype=np.float64)
+        s2 = merged_df["post_bad_call_woba_std"].to_numpy(dtype=np.float64)
+        if _HAVE_NUMEXPR:
+            env = {"s1": s1, "s2": s2, "d": woba_decline, "n1": n1}
+            pooled = ne.evaluate("sqrt((s1 ** 2 + s2 ** 2) / 2)",
+                                 local_dict=env)
+            env["pooled"] = pooled
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = ne.evaluate("d / (pooled * sqrt(2 / n1))", local_dict=env)
+        else:
+            pooled = np.sqrt((s1 ** 2 + s2 ** 2) / 2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = woba_decline / (pooled * np.sqrt(2 / n1))
+        merged_df["significance_score"] = np.where(
+            (n1 < MIN_CLEAN_PAS) | (n2 < MIN_POST_CALL_PAS) | (pooled == 0),
+            np.nan, np.abs(t))
+
+        undervalued = merged_df[merged_df["projected_xwoba_improvement"] > 0]
+        return undervalued.sort_values("projected_xwoba_improvement", ascending=False)
+
+    # -----------------------------
+    # Reporting
+    # -----------------------------
+
+    def generate_scouting_report(self, analysis_df: pd.DataFrame) -> dict:
+        """Build and persist the JSON scouting report.
+
+        Serialized with orjson: the top-25 slice stays record-oriented for
+        the dashboard's target list, but the (potentially large)
+        high-impact section is emitted as a dict of NumPy column arrays —
+        orjson serializes those natively, so no per-cell Python boxing.
+        """
+        top_25 = analysis_df.head(25)
+        high_impact = analysis_df[analysis_df["projected_xwoba_improvement"] >= 0.020]
+
+        scouting_report = {
+            "summary": {
+                "total_undervalued_players": int(len(analysis_df)),
+                "avg_projected_improvement":
+                    float(analysis_df["projected_xwoba_improvement"].mean()),
+                "max_projected_improvement":
+                    float(analysis_df["projected_xwoba_improvement"].max()),
+            },
+            "top_25_targets": top_25.to_dict("records"),
+            "high_impact_targets": {
+                col: high_impact[col].to_numpy() for col in high_impact.columns
+            },
+        }
+
+        # Serialize before opening the file: a failed dumps then leaves the
+        # previous report intact instead of truncating it to zero bytes.
+        payload = orjson.dumps(
+            scouting_report,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+        report_path = os.path.join(self.reports_dir, "scouting_report.json")
+        with open(report_path, "wb") as f:
+            f.write(payload)
+        return scouting_report
+
+    # -----------------------------
+    # Full pipeline
+    # -----------------------------
+
+    def _baseline_cache_path(self, input_filename: str) -> Optional[str]:
+        """Cache location for the baseline table, or None if input is missing.
+
+        Keyed on the PA parquet's mtime_ns and size (the baseline depends
+        on nothing else), so editing or regenerating the input naturally
+        invalidates the cache — same scheme as the report generator's
+        dashboard cache.
+        """
+        stem = os.path.splitext(os.path.join(self.processed_dir, input_filename))[0]
+        try:
+            st = os.stat(f"{stem}.parquet")
+        except OSError:
+            return None
+        key = hashlib.sha1(
+            f"{stem}:{st.st_mtime_ns}:{st.st_size}".encode()).hexdigest()[:16]
+        cache_dir = os.path.join(self.processed_dir, "_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, f"baseline_{key}.parquet")
+
+    def run_full_analysis(self, input_filename: str) -> Tuple[pd.DataFrame, dict]:
+        """Load processed data, score every batter, and persist the outputs."""
+        pa_df, bad_calls_df = self.load_processed_data(input_filename)
+        # One global sort up front: every downstream stage groups or joins
+        # on (batter, pa_id), and grouped data keeps pandas on the fast
+        # already-clustered path (all groupbys below pass sort=False).
+        pa_df = pa_df.sort_values(["batter", "pa_id"]).reset_index(drop=True)
+        calls_df = self.analyze_post_call_performance(pa_df, bad_calls_df)
+        # Baseline aggregation and window collection are independent reads
+        # of the same frames; their groupby/merge kernels release the GIL,
+        # so overlap them the same way the report generator overlaps its
+        # chart builds.
+        cache_path = self._baseline_cache_path(input_filename)
+        if cache_path and os.path.exists(cache_path):
+            baseline_df = pd.read_parquet(cache_path)
+            # Parquet round-trips batter back to a plain integer column;
+            # re-apply the live frames' categorical dtype so the merges in
+            # calculate_psychological_impact_scores keep running on integer
+            # codes instead of degrading the key to object.
+            baseline_df["batter"] = baseline_df["batter"].astype(
+                pa_df["batter"].dtype)
+            impact_df = self.analyze_performance_after_bad_calls(pa_df, calls_df)
+        else:
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                baseline_fut = ex.submit(self.calculate_baseline_performance, pa_df)
+                impact_fut = ex.submit(
+                    self.analyze_performance_after_bad_calls, pa_df, calls_df)
+                baseline_df = baseline_fut.result()
+                impact_df = impact_fut.result()
+            if cache_path:
+                baseline_df.to_parquet(cache_path, engine="pyarrow",
+                                       compression="zstd")
+        analysis_df = self.calculate_psychological_impact_scores(
+            baseline_df, impact_df, calls_df)
+
+        if analysis_df.empty:
+            return analysis_df, {}
+
+        # Parquet is the interchange format the report generator reads
+        # (typed columns, projected scans); the CSV stays alongside it for
+        # spreadsheet-bound consumers.
+        analysis_df.to_parquet(
+            os.path.join(self.reports_dir, "undervalued_targets.parquet"),
+            engine="pyarrow", compression="zstd")
+        analysis_df.to_csv(
+            os.path.join(self.reports_dir, "undervalued_targets.csv"), index=False)
+        scouting_report = self.generate_scouting_report(analysis_df)
+        return analysis_df, scouting_report
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules under src/ import each other flat (no package), same as the
+# examples do with sys.path.append('src').
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,73 @@
+"""Tests for the plate-appearance aggregation in StatcastProcessor."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processor
+from data_processor import StatcastProcessor
+
+
+def _judged_pitches() -> pd.DataFrame:
+    """Two PAs of judged called pitches.
+
+    PA 1's positionally last pitch carries null events/wOBA while an
+    earlier pitch is populated — the case where positional-last and
+    last-non-null aggregation disagree.
+    """
+    return pd.DataFrame({
+        "pa_id": [1, 1, 1, 2, 2],
+        "pitch_number": [1, 2, 3, 1, 2],
+        "batter": [10, 10, 10, 11, 11],
+        "game_date": pd.to_datetime(["2024-05-01"] * 5),
+        "pitcher": [20] * 5,
+        "inning": [1] * 5,
+        "at_bat_number": [1, 1, 1, 2, 2],
+        "balls": [0, 1, 1, 0, 0],
+        "strikes": [0, 0, 1, 0, 1],
+        "description": ["ball", "called_strike", "ball",
+                        "called_strike", "called_strike"],
+        "in_zone": [False, False, True, True, True],
+        "correct_call": [True, False, False, True, True],
+        "call_favors_batter": pd.array([pd.NA, False, True, pd.NA, pd.NA],
+                                       dtype="boolean"),
+        "events": [None, "strikeout", None, None, "walk"],
+        "woba_value": [np.nan, 0.0, np.nan, np.nan, 0.7],
+        "estimated_woba_using_speedangle": [np.nan, 0.1, np.nan, np.nan, 0.6],
+    })
+
+
+def _make_processor(tmp_path) -> StatcastProcessor:
+    # calculate_pa_metrics never touches the connection; a placeholder keeps
+    # the constructor from opening the shared on-disk database.
+    return StatcastProcessor(raw_dir=str(tmp_path),
+                             processed_dir=str(tmp_path / "processed"),
+                             con=object())
+
+
+@pytest.mark.skipif(not data_processor._HAVE_NUMBA, reason="numba not installed")
+def test_pa_metrics_numba_matches_pandas_fallback(tmp_path, monkeypatch):
+    """Both aggregation paths must produce the same tables, including
+    last-non-null outcome semantics when the final pitch has null outcomes."""
+    processor = _make_processor(tmp_path)
+    pa_numba, calls_numba = processor.calculate_pa_metrics(_judged_pitches())
+
+    monkeypatch.setattr(data_processor, "_HAVE_NUMBA", False)
+    pa_pandas, calls_pandas = processor.calculate_pa_metrics(_judged_pitches())
+
+    pd.testing.assert_frame_equal(
+        pa_numba.reset_index(drop=True), pa_pandas.reset_index(drop=True),
+        check_dtype=False)
+    pd.testing.assert_frame_equal(
+        calls_numba.reset_index(drop=True), calls_pandas.reset_index(drop=True),
+        check_dtype=False)
+
+
+def test_pa_metrics_take_last_non_null_outcome(tmp_path):
+    processor = _make_processor(tmp_path)
+    pa_df, _ = processor.calculate_pa_metrics(_judged_pitches())
+    pa_df = pa_df.set_index("pa_id")
+
+    assert pa_df.loc[1, "events"] == "strikeout"
+    assert pa_df.loc[1, "woba_value"] == 0.0
+    assert pa_df.loc[2, "events"] == "walk"
+    assert pa_df.loc[2, "woba_value"] == pytest.approx(0.7)
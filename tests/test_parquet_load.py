@@ -0,0 +1,52 @@
+"""Tests that the DuckDB PA rollup mirrors StatcastProcessor."""
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from parquet_load import PA_VIEWS_SQL
+from test_data_processor import _judged_pitches, _make_processor
+
+
+def _raw_pitches() -> pd.DataFrame:
+    """The judged-pitch fixture re-expressed as raw pitches for the views.
+
+    Plate coordinates are chosen so pitches_judged reproduces the
+    fixture's in_zone column (zone x in [-0.83, 0.83], z in [sz_bot, sz_top]).
+    """
+    df = _judged_pitches()
+    in_zone = df.pop("in_zone").to_numpy()
+    df = df.drop(columns=["pa_id", "correct_call", "call_favors_batter"])
+    df["type"] = np.where(df["description"] == "called_strike", "S", "B")
+    df["plate_x"] = np.where(in_zone, 0.0, 2.0)
+    df["plate_z"] = 2.5
+    df["sz_top"] = 3.5
+    df["sz_bot"] = 1.5
+    return df
+
+
+def test_pa_view_matches_calculate_pa_metrics(tmp_path):
+    """The SQL rollup must keep the last-non-null outcome semantics the
+    in-memory paths implement (DuckDB's last() does not skip NULLs by
+    itself)."""
+    con = duckdb.connect()
+    con.register("pitches", _raw_pitches())
+    con.execute(PA_VIEWS_SQL)
+    sql_pa = con.execute(
+        "SELECT * FROM pa ORDER BY pa_id").df().set_index("at_bat_number")
+
+    processor = _make_processor(tmp_path)
+    mem_pa, _ = processor.calculate_pa_metrics(_judged_pitches())
+    mem_pa = mem_pa.set_index("at_bat_number")
+
+    for at_bat in (1, 2):
+        for col in ("events", "woba_value", "estimated_woba_using_speedangle",
+                    "total_pitches", "total_incorrect_calls",
+                    "incorrect_calls_favoring_batter"):
+            sql_val, mem_val = sql_pa.loc[at_bat, col], mem_pa.loc[at_bat, col]
+            if pd.isna(mem_val):
+                assert pd.isna(sql_val), (at_bat, col, sql_val)
+            elif isinstance(mem_val, float):
+                assert sql_val == pytest.approx(mem_val), (at_bat, col)
+            else:
+                assert sql_val == mem_val, (at_bat, col)
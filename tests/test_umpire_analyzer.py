@@ -0,0 +1,83 @@
+"""Tests for the umpire impact analyzer pipeline."""
+import orjson
+import numpy as np
+import pandas as pd
+import pytest
+
+from umpire_analyzer import UmpireImpactAnalyzer
+
+
+@pytest.fixture
+def processed_dataset(tmp_path):
+    """Write a synthetic PA table + bad-call sibling and return the dirs.
+
+    One batter with 300 plate appearances; four incorrect calls against
+    them, each followed by a 10-PA window of depressed wOBA/xwOBA. Sized
+    so the batter clears MIN_CLEAN_PAS and MIN_POST_CALL_PAS and shows a
+    positive projected improvement.
+    """
+    n_pas = 300
+    batter = 100001
+    call_pas = [50, 70, 90, 110]
+
+    pa_ids = np.arange(1, n_pas + 1, dtype=np.int64)
+    in_window = np.zeros(n_pas, dtype=bool)
+    for call_pa in call_pas:
+        in_window[call_pa:call_pa + 10] = True  # the 10 PAs after call_pa
+
+    has_call = np.isin(pa_ids, call_pas)
+    woba = np.where(in_window, 0.200, 0.400)
+    pa_df = pd.DataFrame({
+        "pa_id": pa_ids,
+        "batter": np.full(n_pas, batter, dtype=np.int64),
+        "game_date": pd.date_range("2024-04-01", periods=n_pas, freq="D"),
+        "woba_value": woba,
+        "estimated_woba_using_speedangle": woba,
+        "total_incorrect_calls": has_call.astype(np.int64),
+        "incorrect_calls_favoring_batter": np.zeros(n_pas, dtype=np.int64),
+    })
+    bad_calls_df = pd.DataFrame({
+        "pa_id": np.array(call_pas, dtype=np.int64),
+        "batter": np.full(len(call_pas), batter, dtype=np.int64),
+        "pitch_number": np.ones(len(call_pas), dtype=np.int64),
+        "description": ["called_strike"] * len(call_pas),
+        "call_favors_batter": [False] * len(call_pas),
+    })
+
+    processed_dir = tmp_path / "processed"
+    reports_dir = tmp_path / "reports"
+    processed_dir.mkdir()
+    pa_df.to_parquet(processed_dir / "sample.parquet", engine="pyarrow")
+    bad_calls_df.to_parquet(processed_dir / "sample_bad_calls.parquet",
+                            engine="pyarrow")
+    return str(processed_dir), str(reports_dir)
+
+
+def test_run_full_analysis_produces_targets(processed_dataset):
+    processed_dir, reports_dir = processed_dataset
+    analyzer = UmpireImpactAnalyzer(processed_dir=processed_dir,
+                                    reports_dir=reports_dir)
+    analysis_df, report = analyzer.run_full_analysis("sample.parquet")
+
+    assert not analysis_df.empty
+    assert (analysis_df["projected_xwoba_improvement"] > 0).all()
+    assert report["summary"]["total_undervalued_players"] == len(analysis_df)
+
+
+def test_run_full_analysis_twice_survives_baseline_cache(processed_dataset):
+    """Warm re-runs read the baseline cache; the parquet round-trip must not
+    degrade the categorical batter key (it previously crashed scoring and
+    truncated scouting_report.json)."""
+    processed_dir, reports_dir = processed_dataset
+    analyzer = UmpireImpactAnalyzer(processed_dir=processed_dir,
+                                    reports_dir=reports_dir)
+    first_df, first_report = analyzer.run_full_analysis("sample.parquet")
+    second_df, second_report = analyzer.run_full_analysis("sample.parquet")
+
+    pd.testing.assert_frame_equal(
+        first_df.reset_index(drop=True), second_df.reset_index(drop=True))
+    assert second_report["summary"] == first_report["summary"]
+
+    with open(f"{reports_dir}/scouting_report.json", "rb") as f:
+        on_disk = orjson.loads(f.read())
+    assert on_disk["summary"] == second_report["summary"]